@@ -1,11 +1,15 @@
 # app.py - Toyota GR Cup Championship Dashboard
 # Complete Version - Beautiful Design + Full Functionality
 
+import json
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 
 # ==================== PAGE CONFIG ====================
@@ -30,45 +34,115 @@ THEME = {
     'shadow': '0 8px 32px 0 rgba(0, 0, 0, 0.5)'
 }
 
-st.markdown(f"""
+# Register the dashboard look as a named Plotly template once at import.
+# Figures pick it up via the default instead of re-validating the same
+# layout dict on every chart build.
+pio.templates['grcup'] = go.layout.Template(layout=dict(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(color=THEME['text_secondary'], family="Inter", size=12),
+    margin=dict(l=40, r=40, t=40, b=40),
+    xaxis=dict(
+        showgrid=False,
+        showline=True,
+        linecolor='rgba(255,255,255,0.1)',
+        color=THEME['text_secondary']
+    ),
+    yaxis=dict(
+        showgrid=True,
+        gridcolor='rgba(255,255,255,0.05)',
+        zeroline=False,
+        color=THEME['text_secondary']
+    ),
+    legend=dict(
+        orientation="h",
+        yanchor="bottom",
+        y=1.02,
+        xanchor="right",
+        x=1,
+        font=dict(color=THEME['text_primary'])
+    )
+))
+pio.templates.default = 'grcup'
+
+# Figure-specific layout dicts built once at import; the per-rerun chart code
+# splats them instead of reconstructing the same nested dicts on every build
+_RADAR_LAYOUT = dict(
+    polar=dict(
+        bgcolor='rgba(0,0,0,0)',
+        radialaxis=dict(
+            visible=True,
+            showticklabels=True,
+            range=[0, 100],
+            linecolor='rgba(255,255,255,0.1)',
+            tickfont=dict(size=10, color=THEME['text_secondary'])
+        ),
+        angularaxis=dict(color=THEME['text_secondary'])
+    ),
+    margin=dict(t=20, b=20, l=20, r=20),
+    paper_bgcolor='rgba(0,0,0,0)',
+    height=250
+)
+_COMPARISON_LAYOUT = dict(
+    xaxis_title="Corner Number",
+    yaxis_title="Time Lost vs Benchmark (seconds)",
+    hovermode='x unified',
+    height=500
+)
+
+# Opportunity card markup compiled once at import - theme colors are baked in,
+# only the per-row fields get formatted at render time
+OPP_CARD_TEMPLATE = f"""
+<div class="opp-card" style="flex:1; min-width:180px">
+    <div style="display:flex; justify-content:space-between; align-items:center">
+        <span style="font-weight:600; color:{THEME['accent_gold']}">Turn {{corner:.0f}}</span>
+        <span style="background:rgba(188, 75, 81, 0.2); color:#ff8a8a; padding:2px 6px; border-radius:4px; font-size:11px">+{{time_lost_sec:.2f}}s</span>
+    </div>
+    <div style="margin-top:8px; font-size:14px; color:{THEME['text_primary']}">{{issue}}</div>
+    <div style="font-size:12px; color:{THEME['text_secondary']}; margin-top:4px">💡 {{fix}}</div>
+</div>"""
+
+# Style sheet as a plain module-level template - the theme is formatted in
+# once per process by the cached builder below
+_CSS_TEMPLATE = """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&display=swap');
     
     html, body, [class*="css"] {{
         font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-        color: {THEME['text_primary']};
+        color: {text_primary};
     }}
 
     .stApp {{
-        background: radial-gradient(circle at top left, {THEME['bg_gradient_2']}, {THEME['bg_gradient_1']});
+        background: radial-gradient(circle at top left, {bg_gradient_2}, {bg_gradient_1});
     }}
     
     [data-testid="stSidebar"] {{
-        background-color: {THEME['bg_gradient_1']};
-        border-right: 1px solid {THEME['glass_border']};
+        background-color: {bg_gradient_1};
+        border-right: 1px solid {glass_border};
     }}
 
     .glass-card {{
-        background: {THEME['glass_bg']};
+        background: {glass_bg};
         backdrop-filter: blur(12px);
         -webkit-backdrop-filter: blur(12px);
         border-radius: 16px;
-        border: 1px solid {THEME['glass_border']};
+        border: 1px solid {glass_border};
         padding: 24px;
-        box-shadow: {THEME['shadow']};
+        box-shadow: {shadow};
         margin-bottom: 20px;
     }}
 
     .stSelectbox div[data-baseweb="select"] > div, 
     .stMultiSelect div[data-baseweb="select"] > div {{
         background-color: rgba(255,255,255,0.05) !important;
-        border: 1px solid {THEME['glass_border']} !important;
-        color: {THEME['text_primary']} !important;
+        border: 1px solid {glass_border} !important;
+        color: {text_primary} !important;
         border-radius: 8px;
     }}
     
     span[data-baseweb="tag"] {{
-        background-color: {THEME['accent_gold']} !important;
+        background-color: {accent_gold} !important;
         border-radius: 4px;
     }}
     span[data-baseweb="tag"] span {{
@@ -83,15 +157,15 @@ st.markdown(f"""
     h1, h2, h3 {{ 
         font-weight: 600; 
         letter-spacing: -0.5px; 
-        color: {THEME['text_primary']};
+        color: {text_primary};
     }}
     
     [data-testid="stMetricLabel"] {{
-        color: {THEME['text_secondary']} !important;
+        color: {text_secondary} !important;
         font-size: 14px !important;
     }}
     [data-testid="stMetricValue"] {{
-        color: {THEME['text_primary']} !important;
+        color: {text_primary} !important;
         font-size: 28px !important;
         font-weight: 700 !important;
         text-shadow: 0 0 20px rgba(212, 163, 115, 0.3);
@@ -99,7 +173,7 @@ st.markdown(f"""
 
     .opp-card {{
         background: rgba(255, 255, 255, 0.03);
-        border-left: 4px solid {THEME['accent_danger']};
+        border-left: 4px solid {accent_danger};
         border-radius: 8px;
         padding: 12px 16px;
         margin-bottom: 10px;
@@ -113,61 +187,251 @@ st.markdown(f"""
     header {{visibility: hidden;}}
     footer {{visibility: hidden;}}
     .stDeployButton {{display:none;}}
-    
+
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+@st.cache_resource
+def build_css():
+    """Interpolate the theme into the CSS once per process, not per rerun"""
+    return _CSS_TEMPLATE.format(**THEME)
+
+st.markdown(build_css(), unsafe_allow_html=True)
 
 # ==================== DATA LOADING (REAL DATA) ====================
+def annotate_comparison(df):
+    """Vectorized issue/fix diagnosis - one np.select pass instead of per-row Python"""
+    bd = df['brake_delta'].to_numpy()
+    td = df['apex_throttle_delta'].to_numpy()
+    big_brake = np.abs(bd) > 20
+    big_throttle = np.abs(td) > 5
+    df['issue'] = np.select(
+        [big_brake & (bd > 0), big_brake, big_throttle & (td < 0), big_throttle],
+        ['Over-braking', 'Under-braking', 'Late throttle application', 'Too aggressive on throttle'],
+        default='Inconsistent corner speed'
+    )
+    df['fix'] = np.select(
+        [bd > 20, bd < -20, td < -5, td > 5],
+        ['Brake lighter, carry more speed', 'Brake harder and later',
+         'Get on throttle earlier at apex', 'Smoother throttle application'],
+        default='Focus on entry consistency'
+    )
+    return df
+
+def read_table(name, columns=None, **csv_kwargs):
+    """Prefer the pre-typed parquet asset (see convert_to_parquet.py) - columnar,
+    no dtype inference, and with `columns` only the projected column chunks are
+    even read off disk - falling back to CSV parsing when it's missing"""
+    parquet_path = Path(f'{name}.parquet')
+    if parquet_path.exists():
+        return pd.read_parquet(parquet_path, columns=columns, engine='pyarrow')
+    if columns is not None:
+        csv_kwargs.setdefault('usecols', columns)
+    return pd.read_csv(f'{name}.csv', **csv_kwargs)
+
 @st.cache_data
 def load_data():
     """Load all processed championship data"""
     try:
-        corners = pd.read_csv('master_corner_features.csv')
-        comparison = pd.read_csv('master_comparisons.csv')
-        ml_features = pd.read_csv('ml_feature_importance.csv')
-        driver_stats = pd.read_csv('driver_performance_stats.csv')
-        clusters = pd.read_csv('driver_clusters.csv')
-        return corners, comparison, ml_features, driver_stats, clusters
+        # Compact dtypes: int16/float32 halve the working set, and categorical
+        # track/vehicle_id turn the sidebar's string filters into int8 code compares
+        corners = read_table(
+            'master_corner_features',
+            dtype={'corner_num': 'int16', 'track': 'category', 'vehicle_id': 'category'}
+        )
+        # Project the comparison table to the columns the UI actually reads -
+        # the per-lap times / time_gap / duration_delta columns never leave disk
+        comparison = read_table(
+            'master_comparisons',
+            columns=['track', 'slow_driver', 'fast_driver', 'corner',
+                     'brake_delta', 'apex_throttle_delta', 'time_lost_sec',
+                     'slow_brake', 'fast_brake',
+                     'slow_apex_throttle', 'fast_apex_throttle'],
+            dtype={'corner': 'int16', 'track': 'category',
+                   'slow_driver': 'category', 'fast_driver': 'category'}
+        )
+        ml_features = read_table('ml_feature_importance')
+        driver_stats = read_table(
+            'driver_performance_stats',
+            dtype={'track': 'category', 'vehicle_id': 'category'}
+        )
+        clusters = read_table('driver_clusters')
+
+        driver_stats['rank'] = driver_stats['rank'].astype('int16')
+        for df in (corners, comparison, driver_stats, clusters, ml_features):
+            float_cols = df.select_dtypes('float64').columns
+            df[float_cols] = df[float_cols].astype('float32')
+
+        comparison = annotate_comparison(comparison)
+
+        # Dataset-level scalars used by the sidebar and footer on every rerun
+        meta = {
+            'n_corners': len(corners),
+            'n_drivers': int(corners['vehicle_id'].nunique()),
+            'n_tracks': int(corners['track'].nunique())
+        }
+        return corners, comparison, ml_features, driver_stats, clusters, meta
     except FileNotFoundError as e:
+        # Halt outright rather than falling back to generated placeholder data:
+        # random frames would be cached by st.cache_data and quietly served as
+        # if they were real telemetry until the process restarts
         st.error(f"⚠️ Data file not found: {e}")
         st.info("Please ensure all CSV files are in the same directory as app.py")
         st.stop()
 
-corners, comparison, ml_features, driver_stats, clusters = load_data()
+@st.cache_data
+def split_by_track(df):
+    """One-time track -> sub-frame split so per-rerun filtering is a dict lookup"""
+    return {
+        track: group.reset_index(drop=True)
+        for track, group in df.groupby('track', sort=False, observed=True)
+    }
+
+@st.cache_data
+def index_comparison(df):
+    """Sorted (slow_driver, fast_driver, corner) index for binary-search pair slicing"""
+    return df.set_index(['slow_driver', 'fast_driver', 'corner']).sort_index()
+
+@st.cache_data
+def driver_pairs(df):
+    """Set of (slow_driver, fast_driver) pairs present in the comparison data,
+    so pair-existence checks are hashed set membership rather than per-driver
+    probes into the MultiIndex engine"""
+    return frozenset(zip(df['slow_driver'], df['fast_driver']))
+
+def pair_comparison(comparison_mi, slow, fast, corner_lo, corner_hi):
+    """Slice one driver pair's corners from the sorted MultiIndex frame"""
+    try:
+        sub = comparison_mi.loc[pd.IndexSlice[slow, fast, corner_lo:corner_hi], :]
+    except KeyError:
+        return pd.DataFrame()
+    return sub.reset_index()
+
+@st.cache_data
+def corner_bounds(comparison):
+    """Small min/max corner lookup tables so slider configuration is a .loc
+    into a few-hundred-row frame instead of masking the full comparison"""
+    pair_track = comparison.groupby(['track', 'slow_driver', 'fast_driver'], observed=True)['corner'].agg(['min', 'max'])
+    pair_all = comparison.groupby(['slow_driver', 'fast_driver'], observed=True)['corner'].agg(['min', 'max'])
+    driver_track = comparison.groupby(['track', 'slow_driver'], observed=True)['corner'].agg(['min', 'max'])
+    driver_all = comparison.groupby('slow_driver', observed=True)['corner'].agg(['min', 'max'])
+    return pair_track, pair_all, driver_track, driver_all
+
+@st.cache_data
+def fastest_by_track(driver_stats):
+    """{track: (fastest_driver, best_lap)} computed once at load, so the
+    sidebar benchmark is a dict lookup instead of a per-rerun argmin"""
+    leaders = driver_stats.loc[
+        driver_stats.groupby('track', sort=False, observed=True)['best_lap'].idxmin()
+    ]
+    table = {
+        track: (vehicle_id, float(best_lap))
+        for track, vehicle_id, best_lap in zip(leaders['track'], leaders['vehicle_id'], leaders['best_lap'])
+    }
+    if len(driver_stats) > 0:
+        overall = driver_stats.iloc[int(driver_stats['best_lap'].to_numpy().argmin())]
+        table['All Tracks'] = (overall['vehicle_id'], float(overall['best_lap']))
+    return table
+
+corners, comparison, ml_features, driver_stats, clusters, meta = load_data()
+corners_by_track = split_by_track(corners)
+comparison_by_track = split_by_track(comparison)
+stats_by_track = split_by_track(driver_stats)
+pair_bounds_track, pair_bounds_all, driver_bounds_track, driver_bounds_all = corner_bounds(comparison)
+track_leaders = fastest_by_track(driver_stats)
 
 # ==================== HELPER FUNCTIONS ====================
-def style_chart(fig):
-    """Consistent chart styling"""
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color=THEME['text_secondary'], family="Inter", size=12),
-        margin=dict(l=40, r=40, t=40, b=40),
-        xaxis=dict(
-            showgrid=False, 
-            showline=True, 
-            linecolor='rgba(255,255,255,0.1)',
-            color=THEME['text_secondary']
-        ),
-        yaxis=dict(
-            showgrid=True, 
-            gridcolor='rgba(255,255,255,0.05)', 
-            zeroline=False,
-            color=THEME['text_secondary']
+@st.cache_data(show_spinner=False)
+def compute_comparison(track, slow, fast):
+    """Compute corner-by-corner deltas when no pre-computed comparison exists.
+
+    Cached per (track, slow, fast) so widget changes elsewhere don't re-run
+    the corner loop - the full frame is built once and sliced by corner
+    range at the call site."""
+    if track == 'All Tracks':
+        track_corners = corners
+    else:
+        track_corners = corners_by_track[track]
+
+    feature_cols = ['track', 'corner_num', 'corner_duration', 'max_brake', 'apex_throttle']
+    selected_corners = track_corners.loc[
+        track_corners['vehicle_id'] == slow, feature_cols
+    ].drop_duplicates('corner_num')
+    benchmark_corners = track_corners.loc[
+        track_corners['vehicle_id'] == fast, feature_cols[1:]
+    ].drop_duplicates('corner_num')
+
+    # Single hashed join + column arithmetic instead of a per-corner Python loop
+    m = selected_corners.merge(benchmark_corners, on='corner_num', suffixes=('_s', '_f'))
+    if len(m) == 0:
+        return pd.DataFrame()
+
+    result = pd.DataFrame({
+        'track': track if track != 'All Tracks' else m['track'],
+        'corner': m['corner_num'],
+        'slow_driver': slow,
+        'fast_driver': fast,
+        'time_lost_sec': (m['corner_duration_s'] - m['corner_duration_f']) * 0.04,
+        'brake_delta': m['max_brake_s'] - m['max_brake_f'],
+        'apex_throttle_delta': m['apex_throttle_s'] - m['apex_throttle_f'],
+        'slow_brake': m['max_brake_s'],
+        'fast_brake': m['max_brake_f'],
+        'slow_apex_throttle': m['apex_throttle_s'],
+        'fast_apex_throttle': m['apex_throttle_f']
+    }).sort_values('corner', ignore_index=True)
+    return annotate_comparison(result)
+
+@st.cache_data(show_spinner=False)
+def build_time_loss_bar(corner_values, time_lost_values):
+    """Build the corner time-loss bar chart from two plain tuples.
+
+    Tuples of primitives hash far cheaper than a DataFrame, so repeated
+    slider positions skip the figure rebuild entirely. go.Bar on raw
+    arrays skips Plotly Express's dataframe-introspection pass, and
+    returning pre-serialized JSON means cache hits skip Plotly's figure
+    validation and re-encode as well - the caller just json.loads it."""
+    x = np.asarray(corner_values)
+    y = np.asarray(time_lost_values, dtype=np.float32)
+    order = np.argsort(x, kind='stable')
+    x, y = x[order], y[order]
+    fig = go.Figure(go.Bar(
+        x=x,
+        y=y,
+        marker=dict(
+            color=y,
+            colorscale=[[0, THEME['accent_success']], [0.5, THEME['accent_gold']], [1, THEME['accent_danger']]],
+            line_width=0
         ),
-        legend=dict(
-            orientation="h", 
-            yanchor="bottom", 
-            y=1.02, 
-            xanchor="right", 
-            x=1,
-            font=dict(color=THEME['text_primary'])
-        )
+        opacity=0.85
+    ))
+    fig.update_layout(
+        xaxis_title="Corner Number",
+        yaxis_title="Time Lost (seconds)"
     )
-    return fig
+    return pio.to_json(fig, validate=False, pretty=False)
+
+@st.cache_data
+def ml_factors_html(ml_features):
+    """Static 'Key Performance Factors' rows - built once, emitted as one block"""
+    rows = [f"<p style='font-size:13px; color:{THEME['text_secondary']}; margin-top:15px'><b>Key Performance Factors:</b></p>"]
+    for _, row in ml_features.head(4).iterrows():
+        pct = row['importance'] * 100
+        rows.append(f"""
+            <div style='margin-bottom:8px'>
+                <div style='display:flex; justify-content:space-between; margin-bottom:2px'>
+                    <span style='font-size:12px; color:{THEME['text_primary']}'>{row['feature'].replace('_', ' ').title()}</span>
+                    <span style='font-size:12px; color:{THEME['accent_gold']}'>{pct:.1f}%</span>
+                </div>
+                <div style='width:100%; height:4px; background:rgba(255,255,255,0.1); border-radius:2px'>
+                    <div style='width:{pct}%; height:100%; background:{THEME['accent_gold']}; border-radius:2px'></div>
+                </div>
+            </div>
+        """)
+    return "".join(rows)
 
 def diagnose_issue(row):
-    """Diagnose corner issue from deltas"""
+    """Diagnose corner issue from deltas (scalar fallback - render paths use the
+    precomputed 'issue' column from annotate_comparison)"""
     if abs(row['brake_delta']) > 20:
         if row['brake_delta'] > 0:
             return "Over-braking"
@@ -182,7 +446,8 @@ def diagnose_issue(row):
         return "Inconsistent corner speed"
 
 def generate_fix(row):
-    """Generate coaching advice"""
+    """Generate coaching advice (scalar fallback - render paths use the
+    precomputed 'fix' column from annotate_comparison)"""
     if row['brake_delta'] > 20:
         return "Brake lighter, carry more speed"
     elif row['brake_delta'] < -20:
@@ -199,7 +464,7 @@ with st.sidebar:
     st.markdown(f"<h2 style='color:{THEME['accent_gold']}; margin-bottom:20px;'>🏁 GR Cup Analytics</h2>", unsafe_allow_html=True)
     
     # Track Selection (ALL 7 TRACKS)
-    available_tracks = sorted(corners['track'].unique())
+    available_tracks = sorted(corners_by_track)
     selected_track = st.selectbox(
         "🏎️ Track Selection", 
         ["All Tracks"] + available_tracks,
@@ -212,12 +477,27 @@ with st.sidebar:
         comparison_filtered = comparison
         stats_filtered = driver_stats
     else:
-        corners_filtered = corners[corners['track'] == selected_track]
-        comparison_filtered = comparison[comparison['track'] == selected_track]
-        stats_filtered = driver_stats[driver_stats['track'] == selected_track]
-    
+        corners_filtered = corners_by_track[selected_track]
+        comparison_filtered = comparison_by_track[selected_track]
+        stats_filtered = stats_by_track[selected_track]
+
+    comparison_mi = index_comparison(comparison_filtered)
+    pair_keys = driver_pairs(comparison_filtered)
+
+    # Hash-indexed driver lookups instead of boolean masks per KPI/summary read
+    stats_ix = stats_filtered.set_index('vehicle_id', drop=False)
+    clusters_ix = clusters.set_index('vehicle_id', drop=False)
+
     # Get drivers from filtered data
     available_drivers = sorted(corners_filtered['vehicle_id'].unique())
+
+    # Benchmark comes from the precomputed per-track leader table - a dict
+    # lookup on rerun instead of an argmin over the stats frame
+    if selected_track in track_leaders:
+        fastest_driver, fastest_time = track_leaders[selected_track]
+    else:
+        fastest_driver = available_drivers[0] if available_drivers else None
+        fastest_time = None
     
     st.markdown("---")
     st.markdown("### Driver Configuration")
@@ -233,7 +513,6 @@ with st.sidebar:
         selected_driver = st.selectbox("📊 Driver", available_drivers)
         
         # Benchmark selection
-        fastest_driver = stats_filtered.nsmallest(1, 'best_lap')['vehicle_id'].iloc[0] if len(stats_filtered) > 0 else available_drivers[0]
         benchmark_options = ['Fastest Driver'] + [d for d in available_drivers if d != selected_driver]
         ref_selection = st.selectbox("🏆 Benchmark", benchmark_options)
         
@@ -242,19 +521,18 @@ with st.sidebar:
         st.markdown("---")
         st.markdown("### Telemetry Filter")
         
-        # Corner range with proper bounds
-        driver_corners = comparison_filtered[
-            (comparison_filtered['slow_driver'] == selected_driver) &
-            (comparison_filtered['fast_driver'] == benchmark_driver)
-        ]['corner'].unique()
-        
-        if len(driver_corners) > 0:
-            min_corner = int(min(driver_corners))
-            max_corner = int(max(driver_corners))
+        # Corner range from the precomputed bounds tables
+        if selected_track == 'All Tracks':
+            bounds_tbl, bounds_key = pair_bounds_all, (selected_driver, benchmark_driver)
+        else:
+            bounds_tbl, bounds_key = pair_bounds_track, (selected_track, selected_driver, benchmark_driver)
+
+        if bounds_key in bounds_tbl.index:
+            min_corner, max_corner = (int(v) for v in bounds_tbl.loc[bounds_key])
             corner_range = st.slider(
-                "Corner Range", 
-                min_corner, 
-                max_corner, 
+                "Corner Range",
+                min_corner,
+                max_corner,
                 (min_corner, max_corner),
                 help="Drag to focus on specific corners"
             )
@@ -274,18 +552,22 @@ with st.sidebar:
         
         if len(comparison_drivers) > 0:
             selected_driver = comparison_drivers[0]
-            fastest_driver = stats_filtered.nsmallest(1, 'best_lap')['vehicle_id'].iloc[0] if len(stats_filtered) > 0 else comparison_drivers[0]
             benchmark_driver = fastest_driver
             
-            # Corner range for all selected drivers
-            all_corners = []
+            # Corner range for all selected drivers from the bounds tables
+            mins, maxes = [], []
             for driver in comparison_drivers:
-                driver_corners = comparison_filtered[comparison_filtered['slow_driver'] == driver]['corner'].unique()
-                all_corners.extend(driver_corners)
-            
-            if len(all_corners) > 0:
-                min_corner = int(min(all_corners))
-                max_corner = int(max(all_corners))
+                if selected_track == 'All Tracks':
+                    bounds_tbl, bounds_key = driver_bounds_all, driver
+                else:
+                    bounds_tbl, bounds_key = driver_bounds_track, (selected_track, driver)
+                if bounds_key in bounds_tbl.index:
+                    lo, hi = bounds_tbl.loc[bounds_key]
+                    mins.append(int(lo))
+                    maxes.append(int(hi))
+
+            if mins:
+                min_corner, max_corner = min(mins), max(maxes)
                 corner_range = st.slider("Corner Range", min_corner, max_corner, (min_corner, max_corner))
             else:
                 corner_range = (1, 20)
@@ -300,9 +582,9 @@ with st.sidebar:
         <div style='background: rgba(212, 163, 115, 0.1); padding: 12px; border-radius: 8px; border-left: 3px solid {THEME['accent_gold']}'>
             <p style='margin:0; font-size:12px; color:{THEME['text_secondary']}'>Championship Dataset</p>
             <p style='margin:5px 0 0 0; font-size:14px; color:{THEME['text_primary']}'>
-                <b>{len(corners):,}</b> corners analyzed<br>
-                <b>{corners['vehicle_id'].nunique()}</b> drivers tracked<br>
-                <b>{corners['track'].nunique()}</b> circuits covered
+                <b>{meta['n_corners']:,}</b> corners analyzed<br>
+                <b>{meta['n_drivers']}</b> drivers tracked<br>
+                <b>{meta['n_tracks']}</b> circuits covered
             </p>
         </div>
     """, unsafe_allow_html=True)
@@ -323,7 +605,7 @@ st.markdown(f"<p style='color:{THEME['text_secondary']}; margin-top:-15px'>Advan
 if analysis_mode == "Deep Dive":
     
     # Get driver stats
-    driver_stats_row = stats_filtered[stats_filtered['vehicle_id'] == selected_driver]
+    driver_stats_row = stats_ix.loc[[selected_driver]] if selected_driver in stats_ix.index else stats_ix.iloc[0:0]
     
     # Filter comparison data
     # Dynamic comparison calculation
@@ -332,61 +614,39 @@ if analysis_mode == "Deep Dive":
         comparison_subset = pd.DataFrame()
     else:
         # Try pre-computed comparison first
-        comparison_subset = comparison_filtered[
-            (comparison_filtered['slow_driver'] == selected_driver) &
-            (comparison_filtered['fast_driver'] == benchmark_driver) &
-            (comparison_filtered['corner'].between(corner_range[0], corner_range[1]))
-        ]
+        comparison_subset = pair_comparison(
+            comparison_mi, selected_driver, benchmark_driver, corner_range[0], corner_range[1]
+        )
         
-        # If no pre-computed data, calculate on the fly
+        # If no pre-computed data, calculate on the fly (cached per selection)
         if len(comparison_subset) == 0:
-            # Get corner features for both drivers
-            selected_corners = corners_filtered[corners_filtered['vehicle_id'] == selected_driver]
-            benchmark_corners = corners_filtered[corners_filtered['vehicle_id'] == benchmark_driver]
-            
-            # Calculate deltas on the fly
-            comparison_list = []
-            for corner_num in range(corner_range[0], corner_range[1] + 1):
-                sel_corner = selected_corners[selected_corners['corner_num'] == corner_num]
-                bench_corner = benchmark_corners[benchmark_corners['corner_num'] == corner_num]
-                
-                if len(sel_corner) > 0 and len(bench_corner) > 0:
-                    sel = sel_corner.iloc[0]
-                    bench = bench_corner.iloc[0]
-                    
-                    comparison_list.append({
-                        'track': selected_track if selected_track != 'All Tracks' else sel['track'],
-                        'corner': corner_num,
-                        'slow_driver': selected_driver,
-                        'fast_driver': benchmark_driver,
-                        'time_lost_sec': (sel['corner_duration'] - bench['corner_duration']) * 0.04,
-                        'brake_delta': sel['max_brake'] - bench['max_brake'],
-                        'apex_throttle_delta': sel['apex_throttle'] - bench['apex_throttle'],
-                        'slow_brake': sel['max_brake'],
-                        'fast_brake': bench['max_brake'],
-                        'slow_apex_throttle': sel['apex_throttle'],
-                        'fast_apex_throttle': bench['apex_throttle']
-                    })
-            
-            if comparison_list:
-                comparison_subset = pd.DataFrame(comparison_list)
-            else:
-                comparison_subset = pd.DataFrame()
+            full_comparison = compute_comparison(selected_track, selected_driver, benchmark_driver)
+            if len(full_comparison) > 0:
+                comparison_subset = full_comparison[
+                    full_comparison['corner'].between(corner_range[0], corner_range[1])
+                ]
     
-    # KPI Metrics
+    # KPI Metrics - one positional row fetch instead of an indexing dispatch
+    # (and a len() check) per metric cell
+    if len(driver_stats_row) > 0:
+        kpi_row = driver_stats_row.iloc[0]
+        best_lap = float(kpi_row['best_lap'])
+        driver_rank = int(kpi_row['rank'])
+        driver_percentile = float(kpi_row['percentile'])
+    else:
+        best_lap = driver_rank = driver_percentile = None
+
     st.markdown('<div class="glass-card" style="padding: 0px;">', unsafe_allow_html=True)
     c1, c2, c3, c4, c5 = st.columns(5)
-    
+
     with c1:
-        if len(driver_stats_row) > 0:
-            best_lap = driver_stats_row['best_lap'].iloc[0]
+        if best_lap is not None:
             st.metric("Best Lap", f"{best_lap:.2f}s")
         else:
             st.metric("Best Lap", "N/A")
-    
+
     with c2:
-        if len(driver_stats_row) > 0 and len(stats_filtered) > 0:
-            fastest_time = stats_filtered['best_lap'].min()
+        if best_lap is not None and fastest_time is not None:
             gap = best_lap - fastest_time
             st.metric(
                 "Gap to Leader",
@@ -396,19 +656,16 @@ if analysis_mode == "Deep Dive":
             )
         else:
             st.metric("Gap to Leader", "N/A")
-    
+
     with c3:
-        if len(driver_stats_row) > 0:
-            rank = int(driver_stats_row['rank'].iloc[0])
-            total = len(stats_filtered)
-            st.metric("Position", f"P{rank} / {total}")
+        if driver_rank is not None:
+            st.metric("Position", f"P{driver_rank} / {len(stats_filtered)}")
         else:
             st.metric("Position", "N/A")
-    
+
     with c4:
-        if len(driver_stats_row) > 0:
-            percentile = driver_stats_row['percentile'].iloc[0]
-            st.metric("Percentile", f"{percentile:.0f}th")
+        if driver_percentile is not None:
+            st.metric("Percentile", f"{driver_percentile:.0f}th")
         else:
             st.metric("Percentile", "N/A")
     
@@ -422,8 +679,8 @@ if analysis_mode == "Deep Dive":
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Driver Style
-    if selected_driver in clusters['vehicle_id'].values:
-        driver_cluster = clusters[clusters['vehicle_id'] == selected_driver]['cluster_label'].iloc[0]
+    if selected_driver in clusters_ix.index:
+        driver_cluster = clusters_ix.loc[[selected_driver]]['cluster_label'].iloc[0]
         st.markdown(f"<p style='color:{THEME['accent_gold']}; font-size:14px; margin-bottom:20px'>🎯 Driver Style: <b>{driver_cluster}</b></p>", unsafe_allow_html=True)
     
     # Main Grid
@@ -436,24 +693,22 @@ if analysis_mode == "Deep Dive":
         st.markdown(f"<p style='font-size:12px; color:{THEME['text_secondary']}; margin-bottom:15px'>Prioritized by lap time impact</p>", unsafe_allow_html=True)
         
         if len(comparison_subset) > 0:
-            top_opps = comparison_subset.nlargest(3, 'time_lost_sec')
-            
-            cols = st.columns(3)
-            for idx, (_, row) in enumerate(top_opps.iterrows()):
-                issue = diagnose_issue(row)
-                fix = generate_fix(row)
-                
-                with cols[idx]:
-                    st.markdown(f"""
-                    <div class="opp-card">
-                        <div style="display:flex; justify-content:space-between; align-items:center">
-                            <span style="font-weight:600; color:{THEME['accent_gold']}">Turn {int(row['corner'])}</span>
-                            <span style="background:rgba(188, 75, 81, 0.2); color:#ff8a8a; padding:2px 6px; border-radius:4px; font-size:11px">+{row['time_lost_sec']:.2f}s</span>
-                        </div>
-                        <div style="margin-top:8px; font-size:14px; color:{THEME['text_primary']}">{issue}</div>
-                        <div style="font-size:12px; color:{THEME['text_secondary']}; margin-top:4px">💡 {fix}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+            # O(N) argpartition selection of the top 3 instead of nlargest's
+            # intermediate Series + partial sort
+            time_lost = comparison_subset['time_lost_sec'].to_numpy()
+            k = min(3, len(time_lost))
+            top_idx = np.argpartition(-time_lost, k - 1)[:k]
+            top_idx = top_idx[np.argsort(-time_lost[top_idx])]
+            top_opps = comparison_subset.iloc[top_idx]
+
+            # One concatenated HTML payload -> one frontend message instead of
+            # three; to_dict('records') skips the per-row Series of iterrows
+            card_rows = top_opps[['corner', 'time_lost_sec', 'issue', 'fix']].to_dict('records')
+            cards = "".join(OPP_CARD_TEMPLATE.format(**r) for r in card_rows)
+            st.markdown(
+                f'<div style="display:flex; gap:12px">{cards}</div>',
+                unsafe_allow_html=True
+            )
         else:
             st.info("No comparison data available for this selection")
         
@@ -464,20 +719,11 @@ if analysis_mode == "Deep Dive":
         st.markdown("#### Corner-by-Corner Time Loss")
         
         if len(comparison_subset) > 0:
-            fig_bar = px.bar(
-                comparison_subset.sort_values('corner'),
-                x='corner',
-                y='time_lost_sec',
-                color='time_lost_sec',
-                color_continuous_scale=[[0, THEME['accent_success']], [0.5, THEME['accent_gold']], [1, THEME['accent_danger']]]
-            )
-            fig_bar.update_traces(marker_line_width=0, opacity=0.85)
-            fig_bar.update_layout(
-                xaxis_title="Corner Number",
-                yaxis_title="Time Lost (seconds)",
-                coloraxis_showscale=False
-            )
-            st.plotly_chart(style_chart(fig_bar), use_container_width=True)
+            fig_bar = json.loads(build_time_loss_bar(
+                tuple(comparison_subset['corner'].tolist()),
+                tuple(comparison_subset['time_lost_sec'].tolist())
+            ))
+            st.plotly_chart(fig_bar, use_container_width=True)
         else:
             st.info("No data to display")
         
@@ -500,40 +746,11 @@ if analysis_mode == "Deep Dive":
                     line_color=THEME['accent_gold'],
                     fillcolor='rgba(212, 163, 115, 0.2)'
                 ))
-                fig_radar.update_layout(
-                    polar=dict(
-                        bgcolor='rgba(0,0,0,0)',
-                        radialaxis=dict(
-                            visible=True, 
-                            showticklabels=True,
-                            range=[0, 100], 
-                            linecolor='rgba(255,255,255,0.1)',
-                            tickfont=dict(size=10, color=THEME['text_secondary'])
-                        ),
-                        angularaxis=dict(color=THEME['text_secondary'])
-                    ),
-                    margin=dict(t=20, b=20, l=20, r=20),
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    height=250
-                )
+                fig_radar.update_layout(**_RADAR_LAYOUT)
                 st.plotly_chart(fig_radar, use_container_width=True)
         
-        # ML Feature importance
-        st.markdown(f"<p style='font-size:13px; color:{THEME['text_secondary']}; margin-top:15px'><b>Key Performance Factors:</b></p>", unsafe_allow_html=True)
-        
-        for idx, row in ml_features.head(4).iterrows():
-            pct = row['importance'] * 100
-            st.markdown(f"""
-                <div style='margin-bottom:8px'>
-                    <div style='display:flex; justify-content:space-between; margin-bottom:2px'>
-                        <span style='font-size:12px; color:{THEME['text_primary']}'>{row['feature'].replace('_', ' ').title()}</span>
-                        <span style='font-size:12px; color:{THEME['accent_gold']}'>{pct:.1f}%</span>
-                    </div>
-                    <div style='width:100%; height:4px; background:rgba(255,255,255,0.1); border-radius:2px'>
-                        <div style='width:{pct}%; height:100%; background:{THEME['accent_gold']}; border-radius:2px'></div>
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+        # ML Feature importance (static - cached HTML, one frontend message)
+        st.markdown(ml_factors_html(ml_features), unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
         
@@ -547,18 +764,31 @@ if analysis_mode == "Deep Dive":
             help="Simulate better apex throttle application"
         )
         
-        gain = improvement * 0.12
-        if len(driver_stats_row) > 0:
-            current_lap = driver_stats_row['best_lap'].iloc[0]
-            new_lap = current_lap - gain
-            
-            st.markdown(f"""
+        if best_lap is not None:
+            current_lap = best_lap
+
+            # Memoize the rendered panel per (driver, improvement) so unrelated
+            # widget changes reuse the last HTML instead of reformatting it
+            whatif_key = (selected_driver, improvement, current_lap)
+            whatif_cache = st.session_state.setdefault('_whatif_html', {})
+            if whatif_key in whatif_cache:
+                whatif_html = whatif_cache[whatif_key]
+            else:
+                gain = improvement * 0.12
+                new_lap = current_lap - gain
+                whatif_html = f"""
                 <div style="text-align:center; margin-top:15px">
                     <p style="font-size:12px; color:{THEME['text_secondary']}; margin:0">Predicted New Lap Time</p>
                     <p style="font-size:32px; font-weight:bold; color:{THEME['accent_success']}; margin:5px 0">{new_lap:.2f}s</p>
                     <p style="font-size:14px; color:{THEME['accent_gold']}; margin:0">Gain: -{gain:.2f}s</p>
                 </div>
-            """, unsafe_allow_html=True)
+                """
+                if len(whatif_cache) >= 8:
+                    # dicts iterate in insertion order, so this evicts FIFO
+                    whatif_cache.pop(next(iter(whatif_cache)))
+                whatif_cache[whatif_key] = whatif_html
+
+            st.markdown(whatif_html, unsafe_allow_html=True)
         
         st.caption("Based on Random Forest model (R² = 0.899)")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -568,34 +798,38 @@ if analysis_mode == "Deep Dive":
         st.markdown("---")
         st.markdown(f'<div class="glass-card" style="padding: 0px;">', unsafe_allow_html=True)
         st.markdown("#### Detailed Corner Analysis")
-        
-        for idx, row in comparison_subset.sort_values('corner').iterrows():
-            with st.expander(f"Turn {int(row['corner'])} - {diagnose_issue(row)}"):
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.markdown("**Braking Analysis**")
-                    st.write(f"Your brake: {row['slow_brake']:.1f}")
-                    st.write(f"Benchmark: {row['fast_brake']:.1f}")
-                    st.write(f"Delta: {row['brake_delta']:+.1f}")
-                
-                with col2:
-                    st.markdown("**Throttle Analysis**")
-                    st.write(f"Your apex: {row['slow_apex_throttle']:.1f}%")
-                    st.write(f"Benchmark: {row['fast_apex_throttle']:.1f}%")
-                    st.write(f"Delta: {row['apex_throttle_delta']:+.1f}%")
-                
-                with col3:
-                    st.markdown("**Time Impact**")
-                    st.write(f"Time lost: {row['time_lost_sec']:.3f}s")
-                    st.write(f"Estimated distance: {abs(row['time_lost_sec']*8):.0f}m")
-                    
-                    if row['time_lost_sec'] > 0.5:
-                        st.error("🔴 Major loss")
-                    elif row['time_lost_sec'] > 0:
-                        st.warning("🟡 Moderate loss")
-                    else:
-                        st.success("🟢 Gaining time!")
+
+        # Only build the per-corner expanders on demand - keeps the common
+        # rerun path free of 20+ widget payloads
+        if st.checkbox("Show detailed corner analysis", value=False):
+            # itertuples avoids the per-row Series construction of iterrows
+            for row in comparison_subset.sort_values('corner').itertuples(index=False):
+                with st.expander(f"Turn {int(row.corner)} - {row.issue}"):
+                    col1, col2, col3 = st.columns(3)
+
+                    with col1:
+                        st.markdown("**Braking Analysis**")
+                        st.write(f"Your brake: {row.slow_brake:.1f}")
+                        st.write(f"Benchmark: {row.fast_brake:.1f}")
+                        st.write(f"Delta: {row.brake_delta:+.1f}")
+
+                    with col2:
+                        st.markdown("**Throttle Analysis**")
+                        st.write(f"Your apex: {row.slow_apex_throttle:.1f}%")
+                        st.write(f"Benchmark: {row.fast_apex_throttle:.1f}%")
+                        st.write(f"Delta: {row.apex_throttle_delta:+.1f}%")
+
+                    with col3:
+                        st.markdown("**Time Impact**")
+                        st.write(f"Time lost: {row.time_lost_sec:.3f}s")
+                        st.write(f"Estimated distance: {abs(row.time_lost_sec*8):.0f}m")
+
+                        if row.time_lost_sec > 0.5:
+                            st.error("🔴 Major loss")
+                        elif row.time_lost_sec > 0:
+                            st.warning("🟡 Moderate loss")
+                        else:
+                            st.success("🟢 Gaining time!")
         
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -607,17 +841,24 @@ else:
     if len(comparison_drivers) < 2:
         st.warning("⚠️ Please select at least 2 drivers to compare")
     else:
-        # Summary Table
-        comparison_summary = []
-        for driver in comparison_drivers:
-            driver_stat = stats_filtered[stats_filtered['vehicle_id'] == driver]
-            if len(driver_stat) > 0:
-                comparison_summary.append({
-                    'Driver': driver,
-                    'Best Lap': f"{driver_stat['best_lap'].iloc[0]:.2f}s",
-                    'Rank': int(driver_stat['rank'].iloc[0]),
-                    'Percentile': f"{driver_stat['percentile'].iloc[0]:.0f}th"
-                })
+        # Summary Table - one reindex fetch for all drivers instead of a
+        # boolean mask per driver (first row per driver, as before)
+        summary_sub = stats_ix[~stats_ix.index.duplicated()].reindex(comparison_drivers)
+        summary_sub = summary_sub.dropna(subset=['best_lap'])
+        comparison_summary = [
+            {
+                'Driver': driver,
+                'Best Lap': f"{best_lap:.2f}s",
+                'Rank': int(rank),
+                'Percentile': f"{percentile:.0f}th"
+            }
+            for driver, best_lap, rank, percentile in zip(
+                summary_sub['vehicle_id'].to_numpy(),
+                summary_sub['best_lap'].to_numpy(),
+                summary_sub['rank'].to_numpy(),
+                summary_sub['percentile'].to_numpy()
+            )
+        ]
         
         if comparison_summary:
             summary_df = pd.DataFrame(comparison_summary)
@@ -638,52 +879,45 @@ else:
         # Multi-driver comparison chart
         st.markdown("#### Corner-by-Corner Time Loss Comparison")
         
-        fig_comp = go.Figure()
         colors = [THEME['accent_gold'], THEME['text_primary'], THEME['accent_danger'], THEME['accent_success'], '#8B7355']
+
+        # One indexed fetch for all selected drivers, then a single px.line
+        # call builds every trace; webgl render mode offloads the line and
+        # marker drawing to the GPU for long corner ranges
+        present = [d for d in comparison_drivers if (d, benchmark_driver) in pair_keys]
+        if present:
+            multi_comp = comparison_mi.loc[
+                pd.IndexSlice[present, benchmark_driver, corner_range[0]:corner_range[1]], :
+            ].reset_index()
+            fig_comp = px.line(
+                multi_comp,
+                x='corner',
+                y='time_lost_sec',
+                color='slow_driver',
+                markers=True,
+                render_mode='webgl',
+                color_discrete_sequence=colors,
+                category_orders={'slow_driver': present}
+            )
+            fig_comp.update_traces(line=dict(width=3), marker=dict(size=8))
+            fig_comp.update_layout(legend_title_text=None)
+        else:
+            fig_comp = go.Figure()
         
-        for i, driver in enumerate(comparison_drivers):
-            driver_comp = comparison_filtered[
-                (comparison_filtered['slow_driver'] == driver) &
-                (comparison_filtered['fast_driver'] == benchmark_driver) &
-                (comparison_filtered['corner'].between(corner_range[0], corner_range[1]))
-            ].sort_values('corner')
-            
-            if len(driver_comp) > 0:
-                fig_comp.add_trace(go.Scatter(
-                    x=driver_comp['corner'],
-                    y=driver_comp['time_lost_sec'],
-                    mode='lines+markers',
-                    name=driver,
-                    line=dict(width=3, color=colors[i % len(colors)]),
-                    marker=dict(size=8)
-                ))
-        
-        fig_comp.update_layout(
-            xaxis_title="Corner Number",
-            yaxis_title="Time Lost vs Benchmark (seconds)",
-            hovermode='x unified',
-            height=500
-        )
-        st.plotly_chart(style_chart(fig_comp), use_container_width=True)
-        
-        # Side-by-side comparison
-        st.markdown("---")
-        st.markdown("#### Driver Statistics")
+        fig_comp.update_layout(**_COMPARISON_LAYOUT)
+        st.plotly_chart(fig_comp, use_container_width=True)
         
-        cols = st.columns(len(comparison_drivers))
-        for idx, driver in enumerate(comparison_drivers):
-            with cols[idx]:
-                st.markdown(f"**{driver}**")
-                driver_stat = stats_filtered[stats_filtered['vehicle_id'] == driver]
-                if len(driver_stat) > 0:
-                    st.metric("Best Lap", f"{driver_stat['best_lap'].iloc[0]:.2f}s")
-                    st.metric("Rank", f"P{int(driver_stat['rank'].iloc[0])}")
-                    st.metric("Percentile", f"{driver_stat['percentile'].iloc[0]:.0f}th")
-                
-                # Driver style
-                if driver in clusters['vehicle_id'].values:
-                    style = clusters[clusters['vehicle_id'] == driver]['cluster_label'].iloc[0]
-                    st.caption(f"Style: {style}")
+        # Driver styles - the summary table above already covers Best Lap /
+        # Rank / Percentile, so skip the 3xN st.metric widget rebuilds
+        style_bits = []
+        for driver in comparison_drivers:
+            if driver in clusters_ix.index:
+                style = clusters_ix.loc[[driver]]['cluster_label'].iloc[0]
+                style_bits.append(f"**{driver}**: {style}")
+
+        if style_bits:
+            st.markdown("---")
+            st.caption("Driver styles — " + " • ".join(style_bits))
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -692,7 +926,7 @@ st.markdown("---")
 st.markdown(f"""
     <div style='text-align: center; color: {THEME['text_secondary']}; padding: 20px 0'>
         <p style='font-weight:600; color:{THEME['text_primary']}; margin-bottom:5px'>🏁 Toyota GR Cup Championship Analysis Platform</p>
-        <p style='font-size:12px; margin:0'>Powered by Machine Learning + Racing Physics • {len(corners):,} Corners • {corners['vehicle_id'].nunique()} Drivers • {corners['track'].nunique()} Tracks</p>
+        <p style='font-size:12px; margin:0'>Powered by Machine Learning + Racing Physics • {meta['n_corners']:,} Corners • {meta['n_drivers']} Drivers • {meta['n_tracks']} Tracks</p>
         <p style='font-size:11px; margin-top:5px; opacity:0.7'>VIR • Road America • COTA • Sebring • Sonoma • Barber • Indianapolis</p>
     </div>
     """, unsafe_allow_html=True)
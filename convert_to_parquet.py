@@ -0,0 +1,29 @@
+# convert_to_parquet.py - One-time conversion of the dashboard CSVs to parquet
+# Parquet loads ~5-10x faster than CSV (columnar, pre-typed, no string parsing)
+# and preserves the compact dtypes the dashboard expects.
+
+import pandas as pd
+
+CSV_DTYPES = {
+    'master_corner_features': {'corner_num': 'int16', 'track': 'category', 'vehicle_id': 'category'},
+    'master_comparisons': {'corner': 'int16', 'track': 'category',
+                           'slow_driver': 'category', 'fast_driver': 'category'},
+    'ml_feature_importance': {},
+    'driver_performance_stats': {'track': 'category', 'vehicle_id': 'category'},
+    'driver_clusters': {},
+}
+
+
+def convert_all():
+    for name, dtypes in CSV_DTYPES.items():
+        df = pd.read_csv(f'{name}.csv', dtype=dtypes)
+        if name == 'driver_performance_stats':
+            df['rank'] = df['rank'].astype('int16')
+        float_cols = df.select_dtypes('float64').columns
+        df[float_cols] = df[float_cols].astype('float32')
+        df.to_parquet(f'{name}.parquet', index=False)
+        print(f'{name}.parquet written ({len(df):,} rows)')
+
+
+if __name__ == '__main__':
+    convert_all()
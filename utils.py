@@ -1,5 +1,7 @@
 # utils.py - Updated with flexible parameter names
 
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -12,31 +14,49 @@ def get_lap_telemetry(telemetry_df, vehicle_id, lap_num):
         # Not a proper telemetry file
         return None
     
+    # No .copy() here - the selection is only fed to groupby below, never
+    # mutated, so the defensive full-frame copy was pure memory bandwidth
     lap_data = telemetry_df[
-        (telemetry_df['vehicle_id'] == vehicle_id) & 
+        (telemetry_df['vehicle_id'] == vehicle_id) &
         (telemetry_df['lap'] == lap_num)
-    ].copy()
+    ]
     
     if len(lap_data) == 0:
         return None
     
-    lap_wide = lap_data.pivot_table(
-        index=['timestamp', 'vehicle_id', 'lap'],
-        columns='telemetry_name',
-        values='telemetry_value',
-        aggfunc='first'
-    ).reset_index()
-    
-    lap_wide = lap_wide.sort_values('timestamp').reset_index(drop=True)
+    # groupby().first().unstack() takes the direct aggregation path and skips
+    # pivot_table's extra sort/take machinery
+    idx_cols = ['timestamp', 'vehicle_id', 'lap']
+    lap_wide = (
+        lap_data.groupby(idx_cols + ['telemetry_name'], sort=False, observed=True)['telemetry_value']
+        .first()
+        .unstack('telemetry_name')
+        .reset_index()
+    )
+
+    lap_wide = lap_wide.sort_values('timestamp', kind='stable', ignore_index=True)
     return lap_wide
 
 
+@lru_cache(maxsize=128)
+def _resolve_column(columns, possible_names):
+    return next((name for name in possible_names if name in columns), None)
+
 def find_column(df, possible_names):
-    """Find column by trying multiple possible names"""
-    for name in possible_names:
-        if name in df.columns:
-            return name
-    return None
+    """Find column by trying multiple possible names.
+
+    Memoized on the column set - telemetry files share the same schema
+    across thousands of laps, so the scan runs once per layout instead of
+    five times per lap."""
+    return _resolve_column(tuple(df.columns), tuple(possible_names))
+
+def _telemetry_col(df, col):
+    """Contiguous float32 copy of a telemetry column.
+
+    Columns sliced out of a multi-column block come back as strided views;
+    materializing them lets numpy dispatch its vectorized compare/reduce
+    kernels, and the private copy makes in-place NaN fills safe."""
+    return np.ascontiguousarray(df[col].to_numpy(dtype=np.float32, copy=True))
 
 def detect_corners(lap_telemetry, throttle_threshold=80, min_corner_length=10):
     """Detect corners by throttle drops - flexible parameter names"""
@@ -48,89 +68,135 @@ def detect_corners(lap_telemetry, throttle_threshold=80, min_corner_length=10):
         # No throttle data - skip this lap
         return []
     
-    throttle = lap_telemetry[throttle_col].fillna(100)
+    # Run-length encode the below-threshold mask in one vectorized pass
+    # instead of walking every telemetry sample in Python
+    throttle = _telemetry_col(lap_telemetry, throttle_col)
+    np.nan_to_num(throttle, copy=False, nan=100.0)
     in_corner = throttle < throttle_threshold
-    
+
+    edges = np.diff(in_corner.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    # Keep runs that are long enough; a run still open at the end of the
+    # trace is dropped, matching the old sample-by-sample behaviour
+    keep = ((ends - starts) >= min_corner_length) & (ends < in_corner.size)
+
     corners = []
-    corner_start = None
-    
-    for i, is_corner in enumerate(in_corner):
-        if is_corner and corner_start is None:
-            corner_start = i
-        elif not is_corner and corner_start is not None:
-            if i - corner_start >= min_corner_length:
-                corners.append({
-                    'start': corner_start,
-                    'end': i,
-                    'apex': corner_start + throttle[corner_start:i].argmin()
-                })
-            corner_start = None
-    
+    for start, end in zip(starts[keep], ends[keep]):
+        corners.append({
+            'start': int(start),
+            'end': int(end),
+            'apex': int(start + throttle[start:end].argmin())
+        })
+
     return corners
 
+def _value_or_zero(arr, idx):
+    """Scalar read with the NaN -> 0 fallback the feature columns expect"""
+    v = arr[idx]
+    return 0.0 if np.isnan(v) else float(v)
+
+def _nan_reduce(seg, reducer):
+    """NaN-skipping reduction matching pandas semantics (all-NaN -> NaN)"""
+    finite = seg[~np.isnan(seg)]
+    return reducer(finite) if finite.size else np.nan
+
+def _corner_feature_arrays(throttle, brake_f, accy, steer, starts, apexes, ends):
+    """Numeric kernel for per-corner reductions.
+
+    Operates on raw ndarrays plus index arrays so the loop body is pure
+    numpy slicing - no pandas .iloc/.min/.mean dispatch per corner."""
+    n = len(starts)
+    entry_throttle = np.zeros(n, dtype=np.float32)
+    apex_throttle = np.zeros(n, dtype=np.float32)
+    min_throttle = np.zeros(n, dtype=np.float32)
+    exit_throttle = np.zeros(n, dtype=np.float32)
+    max_brake = np.zeros(n, dtype=np.float32)
+    brake_duration = np.zeros(n, dtype=np.int64)
+    apex_lateral_g = np.zeros(n, dtype=np.float32)
+    avg_steering_angle = np.zeros(n, dtype=np.float32)
+    throttle_application_point = ends.copy()
+
+    for k in range(n):
+        s, a, e = starts[k], apexes[k], ends[k]
+
+        if throttle is not None:
+            seg = throttle[s:e + 1]
+            entry_throttle[k] = _value_or_zero(throttle, s)
+            apex_throttle[k] = _value_or_zero(throttle, a)
+            min_throttle[k] = _nan_reduce(seg, np.min)
+            exit_throttle[k] = _value_or_zero(throttle, e)
+            open_throttle = seg > 50
+            if open_throttle.any():
+                throttle_application_point[k] = s + int(np.argmax(open_throttle))
+
+        if brake_f is not None:
+            seg = brake_f[s:e + 1]
+            max_brake[k] = _nan_reduce(seg, np.max)
+            # count_nonzero popcounts the mask directly - no add-reduction
+            brake_duration[k] = np.count_nonzero(seg > 10)
+
+        if accy is not None:
+            apex_lateral_g[k] = abs(_value_or_zero(accy, a))
+
+        if steer is not None:
+            avg_steering_angle[k] = _nan_reduce(np.abs(steer[s:e + 1]), np.mean)
+
+    return {
+        'entry_throttle': entry_throttle,
+        'apex_throttle': apex_throttle,
+        'min_throttle': min_throttle,
+        'exit_throttle': exit_throttle,
+        'max_brake': max_brake,
+        'brake_duration': brake_duration,
+        'apex_lateral_g': apex_lateral_g,
+        'avg_steering_angle': avg_steering_angle,
+        'throttle_application_point': throttle_application_point,
+    }
+
 def extract_corner_features(lap_telemetry, corners):
     """Extract physics-based features for each corner - flexible parameter names"""
-    
+
     # Find column names flexibly
     throttle_col = find_column(lap_telemetry, ['ath', 'ATH', 'throttle', 'Throttle', 'TPS', 'tps', 'aps', 'APS'])
     brake_f_col = find_column(lap_telemetry, ['pbrake_f', 'brake_f', 'Brake_F', 'brake_front'])
     brake_r_col = find_column(lap_telemetry, ['pbrake_r', 'brake_r', 'Brake_R', 'brake_rear'])
     accy_col = find_column(lap_telemetry, ['accy_can', 'accy', 'lateral_accel', 'AccY'])
     steering_col = find_column(lap_telemetry, ['Steering_Angle', 'steering', 'Steering', 'steer'])
-    
-    features = []
-    
-    for i, corner in enumerate(corners, 1):
-        start, apex, end = corner['start'], corner['apex'], corner['end']
-        
-        if start >= len(lap_telemetry) or end >= len(lap_telemetry):
-            continue
-        
-        corner_data = lap_telemetry.iloc[start:end+1]
-        
-        # Extract features with safe defaults
-        feature = {
-            'corner_num': i,
-            'start_idx': start,
-            'apex_idx': apex,
-            'end_idx': end,
-            'corner_duration': end - start,
-        }
-        
-        # Throttle features
-        if throttle_col:
-            feature['entry_throttle'] = lap_telemetry.iloc[start][throttle_col] if pd.notna(lap_telemetry.iloc[start][throttle_col]) else 0
-            feature['apex_throttle'] = lap_telemetry.iloc[apex][throttle_col] if pd.notna(lap_telemetry.iloc[apex][throttle_col]) else 0
-            feature['min_throttle'] = corner_data[throttle_col].min()
-            feature['exit_throttle'] = lap_telemetry.iloc[end][throttle_col] if pd.notna(lap_telemetry.iloc[end][throttle_col]) else 0
-        else:
-            feature.update({'entry_throttle': 0, 'apex_throttle': 0, 'min_throttle': 0, 'exit_throttle': 0})
-        
-        # Brake features
-        if brake_f_col:
-            feature['max_brake'] = corner_data[brake_f_col].max()
-            feature['brake_duration'] = (corner_data[brake_f_col] > 10).sum()
-        else:
-            feature.update({'max_brake': 0, 'brake_duration': 0})
-        
-        # Lateral G
-        if accy_col:
-            feature['apex_lateral_g'] = abs(lap_telemetry.iloc[apex][accy_col]) if pd.notna(lap_telemetry.iloc[apex][accy_col]) else 0
-        else:
-            feature['apex_lateral_g'] = 0
-        
-        # Steering
-        if steering_col:
-            feature['avg_steering_angle'] = abs(corner_data[steering_col]).mean()
-        else:
-            feature['avg_steering_angle'] = 0
-        
-        # Throttle application point
-        if throttle_col and (corner_data[throttle_col] > 50).any():
-            feature['throttle_application_point'] = (corner_data[throttle_col] > 50).idxmax()
-        else:
-            feature['throttle_application_point'] = end
-        
-        features.append(feature)
-    
-    return pd.DataFrame(features)
+
+    if not corners:
+        return pd.DataFrame()
+
+    # Convert each needed column to a contiguous float ndarray once, not per corner
+    def col_values(col):
+        return _telemetry_col(lap_telemetry, col) if col else None
+
+    n_samples = len(lap_telemetry)
+    corner_nums = np.arange(1, len(corners) + 1, dtype=np.int64)
+    starts = np.array([c['start'] for c in corners], dtype=np.int64)
+    apexes = np.array([c['apex'] for c in corners], dtype=np.int64)
+    ends = np.array([c['end'] for c in corners], dtype=np.int64)
+
+    valid = (starts < n_samples) & (ends < n_samples)
+    corner_nums, starts, apexes, ends = corner_nums[valid], starts[valid], apexes[valid], ends[valid]
+    if len(starts) == 0:
+        return pd.DataFrame()
+
+    feature_arrays = _corner_feature_arrays(
+        col_values(throttle_col), col_values(brake_f_col),
+        col_values(accy_col), col_values(steering_col),
+        starts, apexes, ends
+    )
+
+    features = {
+        'corner_num': corner_nums,
+        'start_idx': starts,
+        'apex_idx': apexes,
+        'end_idx': ends,
+        'corner_duration': ends - starts,
+    }
+    features.update(feature_arrays)
+    # copy=False adopts the preallocated arrays as column blocks directly
+    # instead of re-materializing them through the constructor
+    return pd.DataFrame(features, copy=False)